@@ -1,13 +1,13 @@
 """
 RESTful API endpoints for user management.
 """
-from typing import List
-from fastapi import APIRouter, HTTPException, status, Depends
-from fastapi.responses import JSONResponse
+import asyncio
+from typing import AsyncIterator, Iterable, List, Optional, Union
+from fastapi import APIRouter, HTTPException, Query, Request, status, Depends
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
 from app.models.user import User, UserCreate, UserUpdate, UserResponse, UsersResponse, EmailUpdateRequest
 from app.services.user_service import UserService
-from app.repositories.user_repository import UserRepository
 from app.core.exceptions import (
     UserNotFoundException,
     UserAlreadyExistsError, 
@@ -22,17 +22,37 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-# Singleton instance of UserRepository
-_user_repository = UserRepository()
-
-def get_user_service() -> UserService:
+async def get_user_service(request: Request) -> UserService:
     """
     Dependency injection for user service.
     
+    Declared async so FastAPI calls it inline instead of dispatching a
+    plain function to its threadpool on every request.
+    
+    Args:
+        request: Incoming request, used to reach the application state
+        
     Returns:
-        UserService instance
+        Shared UserService instance created at application startup
+    """
+    return request.app.state.user_service
+
+
+async def _stream_json_array(users: Iterable[User]) -> AsyncIterator[str]:
+    """
+    Serialize users as a JSON array, one element per chunk.
+    
+    Args:
+        users: Users to serialize
+        
+    Yields:
+        JSON text fragments that concatenate to a JSON array
     """
-    return UserService(_user_repository)
+    separator = "["
+    for user in users:
+        yield separator + user.model_dump_json()
+        separator = ","
+    yield "]" if separator == "," else "[]"
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -56,7 +76,8 @@ async def create_user(
     try:
         logger.info("Creating user", email=user_data.email)
         
-        user = user_service.create_user(user_data)
+        # Writes run in the worker pool so they cannot stall the event loop
+        user = await asyncio.to_thread(user_service.create_user, user_data)
         return UserResponse(user=user, message="User created successfully")
         
     except UserAlreadyExistsError as e:
@@ -75,19 +96,60 @@ async def create_user(
 
 @router.get("/", response_model=UsersResponse)
 async def get_all_users(
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of users per page"),
     user_service: UserService = Depends(get_user_service)
-) -> UsersResponse:
+) -> Union[UsersResponse, Response]:
     """
-    Get all users.
+    Get all users, optionally one page at a time.
+    
+    Args:
+        cursor: Cursor returned by the previous page
+        limit: Maximum number of users per page
+        user_service: User service dependency
+        
+    Returns:
+        List of users with total count and the cursor for the next page
+        
+    Raises:
+        HTTPException: If the cursor is invalid
+    """
+    try:
+        if cursor is None and limit is None:
+            # The full listing is served from pre-serialized JSON
+            return Response(content=user_service.get_all_users_json(), media_type="application/json")
+        
+        return user_service.get_all_users(cursor=cursor, limit=limit)
+        
+    except ValidationError as e:
+        logger.warning("Invalid pagination request", cursor=cursor, error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/stream")
+async def stream_all_users(
+    user_service: UserService = Depends(get_user_service)
+) -> StreamingResponse:
+    """
+    Stream all users as a JSON array.
+    
+    Users are serialized one at a time instead of building the whole
+    response in memory, which keeps time to first byte low for large
+    user sets.
     
     Args:
         user_service: User service dependency
         
     Returns:
-        List of all users with total count
+        Streaming JSON array of users
     """
-    result = user_service.get_all_users()
-    return result
+    return StreamingResponse(
+        _stream_json_array(user_service.iter_users()),
+        media_type="application/json"
+    )
 
 
 @router.get("/{user_id}", response_model=UserResponse)
@@ -147,7 +209,7 @@ async def update_user(
         HTTPException: If user not found or update fails
     """
     try:
-        user = user_service.update_user(user_id, user_data)
+        user = await asyncio.to_thread(user_service.update_user, user_id, user_data)
         return UserResponse(user=user, message="User updated successfully")
         
     except UserNotFoundException as e:
@@ -194,7 +256,7 @@ async def update_user_email(
         # Create UserUpdate object - FastAPI will handle validation
         update_data = UserUpdate(email=email_data.email)
         
-        user = user_service.update_user(user_id, update_data)
+        user = await asyncio.to_thread(user_service.update_user, user_id, update_data)
         return UserResponse(user=user, message="User email updated successfully")
         
     except UserNotFoundException as e:
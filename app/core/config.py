@@ -2,7 +2,7 @@
 Configuration management for the user management service.
 """
 import os
-from typing import Optional
+from typing import List, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -18,6 +18,12 @@ class Settings(BaseSettings):
     # Server settings
     host: str = Field(default="0.0.0.0", alias="HOST")
     port: int = Field(default=8000, alias="PORT")
+    uds_path: Optional[str] = Field(default=None, alias="UDS_PATH")  # Unix socket instead of host/port
+    worker_threads: int = Field(default=min(32, (os.cpu_count() or 1) * 4), ge=1, alias="WORKER_THREADS")
+    
+    # CORS settings (disable for same-origin or internal-only deployments)
+    enable_cors: bool = Field(default=True, alias="ENABLE_CORS")
+    cors_origins: List[str] = Field(default=["*"], alias="CORS_ORIGINS")
     
     # Database settings (for future extensibility)
     database_url: Optional[str] = Field(default=None, alias="DATABASE_URL")
@@ -26,6 +32,7 @@ class Settings(BaseSettings):
     secret_key: str = Field(default="secret-key", alias="SECRET_KEY")
     algorithm: str = Field(default="HS256", alias="ALGORITHM")
     access_token_expire_minutes: int = Field(default=30, alias="ACCESS_TOKEN_EXPIRE_MINUTES")
+    bcrypt_rounds: int = Field(default=12, ge=4, le=31, alias="BCRYPT_ROUNDS")
     
     # Logging settings
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
@@ -1,67 +1,89 @@
 """
 Main FastAPI application for the user management service.
 """
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import time
 
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.core.exceptions import UserManagementException
 from app.api.users import router as users_router
+from app.repositories.user_repository import UserRepository
+from app.services.user_service import UserService
 
 logger = get_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown."""
+    # Bounded pool for blocking work offloaded from handlers
+    executor = ThreadPoolExecutor(max_workers=settings.worker_threads)
+    asyncio.get_running_loop().set_default_executor(executor)
+    
+    app.state.user_repository = UserRepository()
+    app.state.user_service = UserService(app.state.user_repository)
+    yield
+    
+    executor.shutdown(wait=True)
+
+
 # Create FastAPI application
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="User management backend service",
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    lifespan=lifespan
 )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # This should be configured appropriately
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Add CORS middleware; a frozenset makes the per-request origin check O(1)
+if settings.enable_cors:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=frozenset(settings.cors_origins),
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
 
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add processing time header to responses."""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+# Paths probed frequently by load balancers and orchestrators; not logged
+_SKIP_LOG_PATHS = frozenset({"/", "/health"})
 
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log all incoming requests."""
-    start_time = time.time()
+    """Log requests and add a processing time header to responses."""
+    start_time = time.monotonic_ns()
     
+    if request.url.path in _SKIP_LOG_PATHS:
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = f"{(time.monotonic_ns() - start_time) / 1e9:.6f}"
+        return response
+    
+    url = str(request.url)
     logger.info(
         "Incoming request",
         method=request.method,
-        url=str(request.url),
+        url=url,
         client_ip=request.client.host if request.client else None
     )
     
     response = await call_next(request)
     
-    process_time = time.time() - start_time
+    process_time = (time.monotonic_ns() - start_time) / 1e9
+    response.headers["X-Process-Time"] = f"{process_time:.6f}"
     logger.info(
         "Request completed",
         method=request.method,
-        url=str(request.url),
+        url=url,
         status_code=response.status_code,
         process_time=process_time
     )
@@ -105,25 +127,56 @@ async def general_exception_handler(request: Request, exc: Exception):
 app.include_router(users_router)
 
 
-@app.get("/", tags=["health"])
-async def root():
+# Service info bodies never change at runtime, so they are encoded once
+_ROOT_BODY = json.dumps({
+    "message": "User Management Service",
+    "version": settings.app_version,
+    "status": "healthy",
+    "docs": "/docs"
+}).encode()
+
+_HEALTH_BODY = json.dumps({
+    "status": "healthy",
+    "service": settings.app_name,
+    "version": settings.app_version
+}).encode()
+
+
+@app.get("/", tags=["health"], response_model=dict[str, str])
+async def root() -> Response:
     """Root endpoint with service info."""
-    return {
-        "message": "User Management Service",
-        "version": settings.app_version,
-        "status": "healthy",
-        "docs": "/docs"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
-@app.get("/health", tags=["health"])
-async def health_check():
+@app.get("/health", tags=["health"], response_model=dict[str, str])
+async def health_check() -> Response:
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "service": settings.app_name,
-        "version": settings.app_version
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
+
+
+# The built-in schema route re-encodes the whole schema on every request;
+# replace it with one serving bytes encoded once per root path. The docs
+# and OAuth2 redirect routes stay as FastAPI registers them.
+app.router.routes[:] = [
+    route for route in app.router.routes if getattr(route, "path", None) != app.openapi_url
+]
+_openapi_bodies: Dict[str, bytes] = {}
+
+
+@app.get(app.openapi_url, include_in_schema=False)
+async def openapi_schema(request: Request) -> Response:
+    """OpenAPI schema, encoded once per root path."""
+    root_path = request.scope.get("root_path", "").rstrip("/")
+    body = _openapi_bodies.get(root_path)
+    if body is None:
+        schema = app.openapi()
+        # Advertise the proxy prefix the same way FastAPI's own route does
+        if root_path and app.root_path_in_servers:
+            server_urls = {server.get("url") for server in schema.get("servers", [])}
+            if root_path not in server_urls:
+                schema = {**schema, "servers": [{"url": root_path}] + schema.get("servers", [])}
+        body = _openapi_bodies[root_path] = json.dumps(schema).encode()
+    return Response(content=body, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -131,10 +184,15 @@ if __name__ == "__main__":
     
     logger.info("Starting User Management Service", version=settings.app_version)
     
+    # A Unix domain socket avoids the TCP loopback stack behind a local proxy
+    if settings.uds_path:
+        bind = {"uds": settings.uds_path}
+    else:
+        bind = {"host": settings.host, "port": settings.port}
+    
     uvicorn.run(
         "app.main:app",
-        host=settings.host,
-        port=settings.port,
+        **bind,
         reload=settings.debug,
         log_level=settings.log_level.lower()
     )
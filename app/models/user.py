@@ -1,12 +1,49 @@
 """
 User data models for the user management service.
 """
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Sequence
 from pydantic import BaseModel, EmailStr, Field, field_validator
 import uuid
 
 
+def _check_password_strength(password: str) -> str:
+    """
+    Validate password length and character classes in a single pass.
+    
+    Args:
+        password: Password to validate
+        
+    Returns:
+        The unchanged password
+        
+    Raises:
+        ValueError: If the password is too weak
+    """
+    if len(password) < 8:
+        raise ValueError('Password must be at least 8 characters long')
+    
+    has_upper = has_lower = has_digit = False
+    for c in password:
+        if c.isupper():
+            has_upper = True
+        elif c.islower():
+            has_lower = True
+        elif c.isdigit():
+            has_digit = True
+        else:
+            continue
+        if has_upper and has_lower and has_digit:
+            return password
+    
+    if not has_upper:
+        raise ValueError('Password must contain at least one uppercase letter')
+    if not has_lower:
+        raise ValueError('Password must contain at least one lowercase letter')
+    raise ValueError('Password must contain at least one digit')
+
+
 class UserBase(BaseModel):
     """Base user model with common fields."""
     
@@ -25,15 +62,7 @@ class UserCreate(UserBase):
     @classmethod
     def validate_password(cls, v):
         """Validate password strength."""
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        if not any(c.isupper() for c in v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        if not any(c.islower() for c in v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        if not any(c.isdigit() for c in v):
-            raise ValueError('Password must contain at least one digit')
-        return v
+        return _check_password_strength(v)
 
 
 class UserUpdate(BaseModel):
@@ -50,14 +79,7 @@ class UserUpdate(BaseModel):
     def validate_password(cls, v):
         """Validate password strength if provided."""
         if v is not None:
-            if len(v) < 8:
-                raise ValueError('Password must be at least 8 characters long')
-            if not any(c.isupper() for c in v):
-                raise ValueError('Password must contain at least one uppercase letter')
-            if not any(c.islower() for c in v):
-                raise ValueError('Password must contain at least one lowercase letter')
-            if not any(c.isdigit() for c in v):
-                raise ValueError('Password must contain at least one digit')
+            return _check_password_strength(v)
         return v
 
 
@@ -83,6 +105,37 @@ class User(UserBase):
     }
 
 
+@dataclass(slots=True)
+class UserRecord:
+    """
+    Storage representation of a user.
+    
+    Kept as a slotted dataclass so stored users carry no per-instance
+    ``__dict__`` or pydantic state; converted to ``User`` when returned.
+    """
+    
+    id: str
+    email: str
+    first_name: str
+    last_name: str
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+    password_hash: str
+    
+    def to_model(self) -> User:
+        """Convert the stored record to its API model without re-validation."""
+        return User.model_construct(
+            id=self.id,
+            email=self.email,
+            first_name=self.first_name,
+            last_name=self.last_name,
+            is_active=self.is_active,
+            created_at=self.created_at,
+            updated_at=self.updated_at
+        )
+
+
 class UserResponse(BaseModel):
     """User response model for API responses."""
     
@@ -93,8 +146,9 @@ class UserResponse(BaseModel):
 class UsersResponse(BaseModel):
     """Multiple users response model for API responses."""
     
-    users: list[User]
+    users: Sequence[User]
     total: int
+    next_cursor: Optional[str] = None
     message: str = "Success"
 
 
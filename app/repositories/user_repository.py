@@ -1,20 +1,54 @@
 """
 Thread-safe user repository with in-memory storage.
 """
+import os
 import threading
 import uuid
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
-from passlib.context import CryptContext
+from typing import Dict, Iterator, List, Optional, Tuple
+import bcrypt
 
-from app.models.user import User, UserCreate, UserUpdate
-from app.core.exceptions import UserNotFoundException, UserAlreadyExistsError, DatabaseError
-from app.core.logging import get_logger
+from app.models.user import User, UserCreate, UserRecord, UserUpdate
+from app.core.config import settings
+from app.core.exceptions import UserNotFoundException, UserAlreadyExistsError
 
-logger = get_logger(__name__)
+# bcrypt only uses the first 72 bytes of a password
+_BCRYPT_MAX_BYTES = 72
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+_UTC = timezone.utc
+
+
+def normalize_email(email: str) -> str:
+    """Normalize an email address for the case-insensitive email index and email caches."""
+    return email.lower()
+
+
+def _uuid7(now: datetime) -> str:
+    """
+    Generate a time-ordered UUID version 7 (RFC 9562).
+    
+    The leading 48 bits are the Unix time in milliseconds, so IDs sort by
+    creation time and new users land at the end of ordered indexes.
+    
+    Args:
+        now: Creation time embedded in the ID
+        
+    Returns:
+        UUID string in canonical 36-character form
+    """
+    timestamp_ms = int(now.timestamp() * 1000)
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (
+        (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76                          # version
+        | (rand >> 62 & 0xFFF) << 64         # rand_a
+        | 0b10 << 62                         # RFC 4122 variant
+        | rand & 0x3FFF_FFFF_FFFF_FFFF       # rand_b
+    )
+    return str(uuid.UUID(int=value))
 
 
 class UserRepository:
@@ -22,23 +56,32 @@ class UserRepository:
     Thread-safe user repository with in-memory storage.
     
     This implementation uses proper locking mechanisms to ensure thread safety
-    for concurrent operations on user data.
+    for concurrent operations on user data. Mutations hold the lock so both
+    indexes change together; single-lookup reads rely on dict operations
+    being atomic and do not take it. Stored records are never changed in
+    place: updates publish a replacement record with one dict store, so a
+    lock-free read sees either the old record or the new one, under the GIL
+    and on free-threaded builds alike.
     """
     
     def __init__(self):
         """Initialize the repository with thread-safe storage."""
-        self._users: Dict[str, User] = {}
-        self._email_index: Dict[str, str] = {}  # email -> user_id mapping
-        self._lock = threading.RLock()  # Reentrant lock for nested operations
-        self._logger = logger
+        self._users: Dict[str, UserRecord] = {}
+        self._email_index: Dict[str, str] = {}  # lowercased email -> user_id mapping
+        self._order: List[Tuple[datetime, str]] = []  # sorted (created_at, user_id) keys for pagination
+        # Snapshot of all users, dropped whenever a user changes
+        self._all_users_cache: Optional[Tuple[User, ...]] = None
+        self._version = 0  # bumped by every mutation so callers can key derived caches on it
+        self._lock = threading.Lock()  # Guards writes, snapshot rebuilds and page reads; never taken re-entrantly
     
     def _hash_password(self, password: str) -> str:
         """Hash a password using bcrypt."""
-        return pwd_context.hash(password)
+        salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
+        return bcrypt.hashpw(password.encode()[:_BCRYPT_MAX_BYTES], salt).decode()
     
     def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash."""
-        return pwd_context.verify(plain_password, hashed_password)
+        return bcrypt.checkpw(plain_password.encode()[:_BCRYPT_MAX_BYTES], hashed_password.encode())
     
     def create_user(self, user_data: UserCreate) -> User:
         """
@@ -52,40 +95,117 @@ class UserRepository:
             
         Raises:
             UserAlreadyExistsError: If user with email already exists
-            DatabaseError: If database operation fails
         """
+        user = self._try_create(user_data)
+        if user is None:
+            raise UserAlreadyExistsError(f"User with email {user_data.email} already exists")
+        
+        return user
+    
+    def _try_create(self, user_data: UserCreate) -> Optional[User]:
+        """
+        Create a new user unless the email is already taken.
+        
+        Args:
+            user_data: User creation data
+            
+        Returns:
+            Created user object, or None if a user with the email already exists
+        """
+        # Hash before taking the lock; bcrypt is deliberately slow
+        password_hash = self._hash_password(user_data.password)
+        
+        email_key = normalize_email(user_data.email)
+        
+        # Generate unique ID and timestamps from a single clock read
+        now = datetime.now(_UTC)
+        user_id = _uuid7(now)
+        
         with self._lock:
-            try:
-                # Check if user with email already exists
-                if user_data.email in self._email_index:
+            # Claim the email and detect an existing owner with a single probe
+            if self._email_index.setdefault(email_key, user_id) != user_id:
+                return None
+            
+            # Create user record
+            record = UserRecord(
+                id=user_id,
+                email=user_data.email,
+                first_name=user_data.first_name,
+                last_name=user_data.last_name,
+                is_active=user_data.is_active,
+                created_at=now,
+                updated_at=now,
+                password_hash=password_hash
+            )
+            
+            # Store user data
+            self._users[user_id] = record
+            self._order.insert(bisect_right(self._order, (now, user_id)), (now, user_id))
+            self._all_users_cache = None
+            self._version += 1
+            
+            return record.to_model()
+    
+    def create_many(self, users_data: List[UserCreate]) -> List[User]:
+        """
+        Create several users in one thread-safe operation.
+        
+        Passwords are hashed concurrently (bcrypt releases the GIL) and the
+        whole batch is checked and inserted under a single lock acquisition.
+        Either every user is created or none is.
+        
+        Args:
+            users_data: User creation data for each new user
+            
+        Returns:
+            Created user objects, in input order
+            
+        Raises:
+            UserAlreadyExistsError: If an email already exists or repeats in the batch
+        """
+        if not users_data:
+            return []
+        
+        workers = min(len(users_data), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            password_hashes = list(pool.map(self._hash_password, [u.password for u in users_data]))
+        
+        now = datetime.now(_UTC)
+        # The batch shares one timestamp, so sort the IDs to keep the
+        # (created_at, id) pagination order equal to the input order
+        user_ids = sorted(_uuid7(now) for _ in users_data)
+        email_keys = [normalize_email(user_data.email) for user_data in users_data]
+        records = [
+            UserRecord(
+                id=user_id,
+                email=user_data.email,
+                first_name=user_data.first_name,
+                last_name=user_data.last_name,
+                is_active=user_data.is_active,
+                created_at=now,
+                updated_at=now,
+                password_hash=password_hash
+            )
+            for user_id, user_data, password_hash in zip(user_ids, users_data, password_hashes)
+        ]
+        
+        with self._lock:
+            # Validate the whole batch before touching storage
+            seen = set()
+            for email_key, user_data in zip(email_keys, users_data):
+                if email_key in self._email_index or email_key in seen:
                     raise UserAlreadyExistsError(f"User with email {user_data.email} already exists")
-                
-                # Generate unique ID and timestamps
-                user_id = str(uuid.uuid4())
-                now = datetime.now(timezone.utc)
-                
-                # Create user object
-                user = User(
-                    id=user_id,
-                    email=user_data.email,
-                    first_name=user_data.first_name,
-                    last_name=user_data.last_name,
-                    is_active=user_data.is_active,
-                    created_at=now,
-                    updated_at=now
-                )
-                
-                # Store user data (password is hashed separately for security)
-                self._users[user_id] = user
-                self._email_index[user_data.email] = user_id
-                
-                return user
-                
-            except Exception as e:
-                self._logger.error("Failed to create user", error=str(e), email=user_data.email)
-                if isinstance(e, UserAlreadyExistsError):
-                    raise
-                raise DatabaseError(f"Failed to create user: {str(e)}")
+                seen.add(email_key)
+            
+            for email_key, record in zip(email_keys, records):
+                self._users[record.id] = record
+                self._email_index[email_key] = record.id
+            self._order.extend((now, record.id) for record in records)
+            self._order.sort()
+            self._all_users_cache = None
+            self._version += 1
+        
+        return [record.to_model() for record in records]
     
     def get_user_by_id(self, user_id: str) -> User:
         """
@@ -100,11 +220,26 @@ class UserRepository:
         Raises:
             UserNotFoundError: If user is not found
         """
-        with self._lock:
-            if user_id not in self._users:
-                raise UserNotFoundException(f"User with ID {user_id} not found")
+        record = self._users.get(user_id)
+        if record is None:
+            raise UserNotFoundException(f"User with ID {user_id} not found")
+        
+        return record.to_model()
+    
+    def get_users_by_ids(self, user_ids: List[str]) -> List[User]:
+        """
+        Get several users by ID with thread-safe read operations.
+        
+        Each lookup is a single atomic dict read, so no lock is needed.
+        
+        Args:
+            user_ids: User identifiers to look up
             
-            return self._users[user_id]
+        Returns:
+            Found users in input order; unknown IDs are skipped
+        """
+        users = self._users
+        return [record.to_model() for record in map(users.get, user_ids) if record is not None]
     
     def get_user_by_email(self, email: str) -> User:
         """
@@ -119,22 +254,87 @@ class UserRepository:
         Raises:
             UserNotFoundError: If user is not found
         """
-        with self._lock:
-            if email not in self._email_index:
-                raise UserNotFoundException(f"User with email {email} not found")
-            
-            user_id = self._email_index[email]
-            return self._users[user_id]
+        user_id = self._email_index.get(normalize_email(email))
+        # The user may have been deleted between the two lookups
+        record = self._users.get(user_id) if user_id is not None else None
+        if record is None:
+            raise UserNotFoundException(f"User with email {email} not found")
+        
+        return record.to_model()
     
-    def get_all_users(self) -> List[User]:
+    def get_all_users(self) -> Tuple[User, ...]:
         """
         Get all users with thread-safe read operation.
         
+        The snapshot is built once after each mutation and shared by every
+        read until the next one.
+        
+        Returns:
+            Immutable snapshot of all users
+        """
+        snapshot = self._all_users_cache
+        if snapshot is None:
+            with self._lock:
+                if self._all_users_cache is None:
+                    self._all_users_cache = tuple(record.to_model() for record in self._users.values())
+                snapshot = self._all_users_cache
+        return snapshot
+    
+    def get_all_users_with_count(self) -> Tuple[Tuple[User, ...], int]:
+        """
+        Get all users together with their count from a single snapshot.
+        
         Returns:
-            List of all users
+            Tuple of the users snapshot and the number of users in it
+        """
+        users = self.get_all_users()
+        return users, len(users)
+    
+    def get_version(self) -> int:
+        """
+        Get the current data version.
+        
+        The version increases on every create, update and delete, so
+        anything derived from the stored users can be reused while it
+        stays the same.
+        
+        Returns:
+            Monotonic data version
+        """
+        return self._version
+    
+    def get_users_page(
+        self,
+        after: Optional[Tuple[datetime, str]],
+        limit: int
+    ) -> Tuple[List[User], int]:
+        """
+        Get a page of users ordered by creation time and ID.
+        
+        Args:
+            after: (created_at, user_id) key of the last user already returned,
+                or None to start from the beginning
+            limit: Maximum number of users to return
+            
+        Returns:
+            Tuple of the users on the page and the total number of users
         """
         with self._lock:
-            return list(self._users.values())
+            start = 0 if after is None else bisect_right(self._order, after)
+            keys = self._order[start:start + limit]
+            return [self._users[user_id].to_model() for _, user_id in keys], len(self._users)
+    
+    def iter_users(self) -> Iterator[User]:
+        """
+        Iterate over all users one at a time.
+        
+        A snapshot of the stored references is taken up front, so consumers
+        can stream users without blocking writers.
+        
+        Yields:
+            Each stored user
+        """
+        yield from self.get_all_users()
     
     def update_user(self, user_id: str, user_data: UserUpdate) -> User:
         """
@@ -150,40 +350,98 @@ class UserRepository:
         Raises:
             UserNotFoundError: If user is not found
             UserAlreadyExistsError: If email is being changed to one that already exists
-            DatabaseError: If database operation fails
         """
+        _, user = self.update_user_returning_previous_email(user_id, user_data)
+        return user
+    
+    def update_user_returning_previous_email(
+        self,
+        user_id: str,
+        user_data: UserUpdate
+    ) -> Tuple[str, User]:
+        """
+        Update a user and report the email it had before the update.
+        
+        Both values come from the same locked section, so callers can
+        invalidate anything keyed by the old email without a separate read.
+        
+        Args:
+            user_id: User's unique identifier
+            user_data: User update data
+            
+        Returns:
+            Tuple of the previous email and the updated user object
+            
+        Raises:
+            UserNotFoundError: If user is not found
+            UserAlreadyExistsError: If email is being changed to one that already exists
+        """
+        update_data = user_data.model_dump(exclude_unset=True)
+        
+        # Hash a new password before taking the lock; bcrypt is deliberately slow
+        password = update_data.pop('password', None)
+        if password is not None:
+            update_data['password_hash'] = self._hash_password(password)
+        
+        now = datetime.now(_UTC)
+        
         with self._lock:
-            try:
-                if user_id not in self._users:
-                    raise UserNotFoundException(f"User with ID {user_id} not found")
-                
-                user = self._users[user_id]
-                update_data = user_data.model_dump(exclude_unset=True)
-                
-                # Check if email is being changed and if it already exists
-                if 'email' in update_data and update_data['email'] != user.email:
-                    if update_data['email'] in self._email_index:
-                        raise UserAlreadyExistsError(f"User with email {update_data['email']} already exists")
-                    
-                    # Remove old email from index
-                    del self._email_index[user.email]
-                    # Add new email to index
-                    self._email_index[update_data['email']] = user_id
-                
-                # Update user fields
-                for field, value in update_data.items():
-                    setattr(user, field, value)
-                
-                # Update timestamp
-                user.updated_at = datetime.now(timezone.utc)
-                
-                return user
-                
-            except Exception as e:
-                self._logger.error("Failed to update user", error=str(e), user_id=user_id)
-                if isinstance(e, (UserNotFoundException, UserAlreadyExistsError)):
-                    raise
-                raise DatabaseError(f"Failed to update user: {str(e)}")
+            user = self._users.get(user_id)
+            if user is None:
+                raise UserNotFoundException(f"User with ID {user_id} not found")
+            
+            # Check if email is being changed and if it already exists
+            new_key = None
+            if 'email' in update_data:
+                old_key = normalize_email(user.email)
+                new_key = normalize_email(update_data['email'])
+                if new_key == old_key:
+                    new_key = None
+                elif new_key in self._email_index:
+                    raise UserAlreadyExistsError(f"User with email {update_data['email']} already exists")
+            
+            previous_email = user.email
+            
+            # Publish a new record in one store so lock-free readers never
+            # see a partly applied update
+            user = replace(user, **update_data, updated_at=now)
+            self._users[user_id] = user
+            
+            if new_key is not None:
+                # Move the email index entry to the new address
+                del self._email_index[old_key]
+                self._email_index[new_key] = user_id
+            
+            self._all_users_cache = None
+            self._version += 1
+            
+            return previous_email, user.to_model()
+    
+    def pop_user(self, user_id: str) -> User:
+        """
+        Delete a user and return it in one thread-safe operation.
+        
+        Args:
+            user_id: User's unique identifier
+            
+        Returns:
+            The deleted user object
+            
+        Raises:
+            UserNotFoundError: If user is not found
+        """
+        with self._lock:
+            user = self._users.pop(user_id, None)
+            if user is None:
+                raise UserNotFoundException(f"User with ID {user_id} not found")
+            
+            # Remove from remaining indexes
+            del self._email_index[normalize_email(user.email)]
+            del self._order[bisect_left(self._order, (user.created_at, user_id))]
+            self._all_users_cache = None
+            self._version += 1
+        
+        return user.to_model()
     
     def delete_user(self, user_id: str) -> bool:
         """
@@ -197,26 +455,9 @@ class UserRepository:
             
         Raises:
             UserNotFoundError: If user is not found
-            DatabaseError: If database operation fails
         """
-        with self._lock:
-            try:
-                if user_id not in self._users:
-                    raise UserNotFoundException(f"User with ID {user_id} not found")
-                
-                user = self._users[user_id]
-                
-                # Remove from storage
-                del self._users[user_id]
-                del self._email_index[user.email]
-                
-                return True
-                
-            except Exception as e:
-                self._logger.error("Failed to delete user", error=str(e), user_id=user_id)
-                if isinstance(e, UserNotFoundException):
-                    raise
-                raise DatabaseError(f"Failed to delete user: {str(e)}")
+        self.pop_user(user_id)
+        return True
     
     def get_user_count(self) -> int:
         """
@@ -225,5 +466,4 @@ class UserRepository:
         Returns:
             Total number of users
         """
-        with self._lock:
-            return len(self._users)
\ No newline at end of file
+        return len(self._users)
\ No newline at end of file
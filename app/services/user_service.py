@@ -1,9 +1,19 @@
 """
 User service
 """
-from typing import List, Optional
+import base64
+import binascii
+import inspect
+import logging
+import re
+import threading
+import uuid
+from datetime import datetime
+from functools import lru_cache, wraps
+from typing import Callable, Iterator, List, Optional, Tuple, Type
+from cachetools import TTLCache
 from app.models.user import User, UserCreate, UserUpdate, UsersResponse
-from app.repositories.user_repository import UserRepository
+from app.repositories.user_repository import UserRepository, normalize_email
 from app.core.exceptions import (
     UserNotFoundException,
     UserAlreadyExistsError, 
@@ -14,6 +24,87 @@ from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Page size used when a cursor is supplied without an explicit limit
+DEFAULT_PAGE_SIZE = 50
+
+# Shape check for email addresses, compiled once: local@domain.tld without whitespace
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+# Bounds for the get_user_by_email result cache
+EMAIL_CACHE_SIZE = 10_000
+EMAIL_CACHE_TTL_SECONDS = 60
+
+# Bounds for the cache of emails known not to belong to any user
+EMAIL_MISS_CACHE_SIZE = 50_000
+EMAIL_MISS_CACHE_TTL_SECONDS = 30
+
+
+@lru_cache(maxsize=4096)
+def _is_valid_uuid(value: str) -> bool:
+    """
+    Check that a string is a UUID in canonical 36-character form.
+    
+    Results are cached because the same IDs recur on read-heavy paths.
+    
+    Args:
+        value: Candidate UUID string
+        
+    Returns:
+        True if the string parses as a UUID
+    """
+    if len(value) != 36:
+        return False
+    try:
+        # uuid.UUID ignores hyphens wherever they appear, so compare the
+        # canonical rendering to reject misplaced ones
+        return str(uuid.UUID(value)) == value.lower()
+    except ValueError:
+        return False
+
+
+def _service_guard(
+    action: str,
+    *passthrough: Type[Exception],
+    context: Optional[str] = None
+) -> Callable:
+    """
+    Wrap unexpected errors raised by a service method.
+    
+    Exceptions of the passthrough types propagate unchanged; anything else
+    is logged and re-raised as InvalidUserDataError.
+    
+    Args:
+        action: Description of the operation used in log and error messages
+        passthrough: Exception types the method is allowed to raise as-is
+        context: Argument identifying the affected user, logged with the
+            error; a dotted path such as "user_data.email" logs one attribute
+            of the argument instead of the whole object
+        
+    Returns:
+        Decorator applying the guard to a UserService method
+    """
+    def decorator(method: Callable) -> Callable:
+        signature = inspect.signature(method)
+        
+        @wraps(method)
+        def wrapper(self: "UserService", *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            except passthrough:
+                raise
+            except Exception as e:
+                log_context = {}
+                if context is not None:
+                    name, *attributes = context.split(".")
+                    value = signature.bind(self, *args, **kwargs).arguments.get(name)
+                    for attribute in attributes:
+                        value = getattr(value, attribute, None)
+                    log_context[context.rsplit(".", 1)[-1]] = value
+                self._logger.error("Unexpected service error", action=action, error=str(e), **log_context)
+                raise InvalidUserDataError(f"Failed to {action}: {str(e)}")
+        return wrapper
+    return decorator
+
 
 class UserService:
     """
@@ -31,8 +122,24 @@ class UserService:
             user_repository: Repository for data access operations
         """
         self._repository = user_repository
-        self._logger = logger
+        # Bind the component once instead of passing it on every call
+        self._logger = logger.bind(component="user_service")
+        # Log level is fixed at startup, so the INFO check is resolved once here
+        self._log_info_enabled = self._logger.isEnabledFor(logging.INFO)
+        # Lowercased email -> User, invalidated by every write made through this service
+        self._email_cache: TTLCache = TTLCache(maxsize=EMAIL_CACHE_SIZE, ttl=EMAIL_CACHE_TTL_SECONDS)
+        # Lowercased emails that recently matched no user, so repeated misses skip the repository
+        self._email_miss_cache: TTLCache = TTLCache(
+            maxsize=EMAIL_MISS_CACHE_SIZE, ttl=EMAIL_MISS_CACHE_TTL_SECONDS
+        )
+        self._email_cache_lock = threading.Lock()
+        # (repository version, serialized UsersResponse) for the unpaginated listing
+        self._users_json: Optional[Tuple[int, bytes]] = None
     
+    @_service_guard(
+        "create user", UserAlreadyExistsError, InvalidUserDataError, ValidationError,
+        context="user_data.email"
+    )
     def create_user(self, user_data: UserCreate) -> User:
         """
         Create a new user with business logic validation.
@@ -48,22 +155,48 @@ class UserService:
             InvalidUserDataError: If user data is invalid
             ValidationError: If validation fails
         """
-        try:
+        if self._log_info_enabled:
             self._logger.info("Creating user", email=user_data.email)
+        
+        # Additional business logic validation
+        self._validate_user_creation(user_data)
+        
+        # Create user through repository
+        user = self._repository.create_user(user_data)
+        self.invalidate_email(user.email)
+        return user
+    
+    @_service_guard("create users", UserAlreadyExistsError, InvalidUserDataError, ValidationError)
+    def bulk_create_users(self, users_data: List[UserCreate]) -> List[User]:
+        """
+        Create several users at once with business logic validation.
+        
+        The whole batch is validated before anything is stored, and the
+        repository inserts it under a single lock acquisition.
+        
+        Args:
+            users_data: User creation data for each new user
             
-            # Additional business logic validation
-            self._validate_user_creation(user_data)
-            
-            # Create user through repository
-            user = self._repository.create_user(user_data)
-            return user
+        Returns:
+            Created user objects, in input order
             
-        except (UserAlreadyExistsError, InvalidUserDataError, ValidationError):
-            raise
-        except Exception as e:
-            self._logger.error("Unexpected error creating user", error=str(e), email=user_data.email)
-            raise InvalidUserDataError(f"Failed to create user: {str(e)}")
+        Raises:
+            UserAlreadyExistsError: If an email already exists or repeats in the batch
+            InvalidUserDataError: If user data is invalid
+            ValidationError: If validation fails
+        """
+        if self._log_info_enabled:
+            self._logger.info("Creating users", count=len(users_data))
+        
+        for user_data in users_data:
+            self._validate_user_creation(user_data)
+        
+        users = self._repository.create_many(users_data)
+        for user in users:
+            self.invalidate_email(user.email)
+        return users
     
+    @_service_guard("retrieve user", UserNotFoundException, context="user_id")
     def get_user_by_id(self, user_id: str) -> User:
         """
         Get user by ID with business logic validation.
@@ -78,18 +211,32 @@ class UserService:
             UserNotFoundError: If user is not found
             InvalidUserDataError: If user ID is invalid
         """
-        try:
-            self._validate_user_id(user_id)
+        self._validate_user_id(user_id)
+        
+        user = self._repository.get_user_by_id(user_id)
+        return user
+    
+    @_service_guard("retrieve users", InvalidUserDataError)
+    def get_users_by_ids(self, user_ids: List[str]) -> List[User]:
+        """
+        Get several users by ID in one call.
+        
+        Args:
+            user_ids: User identifiers to look up
             
-            user = self._repository.get_user_by_id(user_id)
-            return user
+        Returns:
+            Found users in input order; unknown IDs are skipped
             
-        except UserNotFoundException:
-            raise
-        except Exception as e:
-            self._logger.error("Unexpected error retrieving user", error=str(e), user_id=user_id)
-            raise InvalidUserDataError(f"Failed to retrieve user: {str(e)}")
+        Raises:
+            InvalidUserDataError: If any user ID is invalid
+        """
+        invalid = [user_id for user_id in user_ids if not user_id or not _is_valid_uuid(user_id)]
+        if invalid:
+            raise InvalidUserDataError(f"Invalid user ID format: {invalid[0]}")
+        
+        return self._repository.get_users_by_ids(user_ids)
     
+    @_service_guard("retrieve user by email", UserNotFoundException, context="email")
     def get_user_by_email(self, email: str) -> User:
         """
         Get user by email with business logic validation.
@@ -104,34 +251,98 @@ class UserService:
             UserNotFoundError: If user is not found
             InvalidUserDataError: If email is invalid
         """
-        try:
-            self._validate_email(email)
+        self._validate_email(email)
+        
+        key = normalize_email(email)
+        # Misses fetch and store under the lock so a concurrent
+        # invalidation cannot be overtaken by a stale entry
+        with self._email_cache_lock:
+            user = self._email_cache.get(key)
+            if user is None:
+                if key in self._email_miss_cache:
+                    raise UserNotFoundException(f"User with email {email} not found")
+                try:
+                    user = self._repository.get_user_by_email(email)
+                except UserNotFoundException:
+                    self._email_miss_cache[key] = True
+                    raise
+                self._email_cache[key] = user
+        return user
+    
+    @_service_guard("retrieve users", ValidationError)
+    def get_all_users(
+        self,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> UsersResponse:
+        """
+        Get all users with business logic processing.
+        
+        Without a cursor or limit every user is returned. Otherwise a single
+        page is returned along with an opaque cursor for the next page.
+        
+        Args:
+            cursor: Opaque cursor returned by a previous page
+            limit: Maximum number of users to return
             
-            user = self._repository.get_user_by_email(email)
-            return user
+        Returns:
+            UsersResponse with list of users, total count and next cursor
             
-        except UserNotFoundException:
-            raise
-        except Exception as e:
-            self._logger.error("Unexpected error retrieving user by email", error=str(e), email=email)
-            raise InvalidUserDataError(f"Failed to retrieve user by email: {str(e)}")
+        Raises:
+            ValidationError: If the cursor is malformed
+        """
+        if cursor is None and limit is None:
+            users, total = self._repository.get_all_users_with_count()
+            # Users come from the repository already validated
+            return UsersResponse.model_construct(users=users, total=total)
+        
+        limit = limit or DEFAULT_PAGE_SIZE
+        after = self._decode_cursor(cursor) if cursor is not None else None
+        
+        # Fetch one extra user to detect whether another page exists
+        users, total = self._repository.get_users_page(after, limit + 1)
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = self._encode_cursor(users[-1])
+        return UsersResponse.model_construct(users=users, total=total, next_cursor=next_cursor)
     
-    def get_all_users(self) -> UsersResponse:
+    @_service_guard("retrieve users")
+    def get_all_users_json(self) -> bytes:
         """
-        Get all users with business logic processing.
+        Get the full users listing as serialized JSON.
+        
+        The serialized body is reused until the repository version changes,
+        so repeated listings skip per-user serialization.
         
         Returns:
-            UsersResponse with list of users and total count
+            JSON-encoded UsersResponse with every user
         """
-        try:
-            users = self._repository.get_all_users()
-            total = self._repository.get_user_count()
-            return UsersResponse(users=users, total=total)
-            
-        except Exception as e:
-            self._logger.error("Unexpected error retrieving all users", error=str(e))
-            raise InvalidUserDataError(f"Failed to retrieve users: {str(e)}")
+        # Read the version before the users: a write in between only makes
+        # the cached body newer than its key, which forces a rebuild later
+        version = self._repository.get_version()
+        cached = self._users_json
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        users, total = self._repository.get_all_users_with_count()
+        body = UsersResponse.model_construct(users=users, total=total).model_dump_json().encode()
+        self._users_json = (version, body)
+        return body
     
+    def iter_users(self) -> Iterator[User]:
+        """
+        Iterate over all users without building a response model.
+        
+        Returns:
+            Iterator yielding each user
+        """
+        return self._repository.iter_users()
+    
+    @_service_guard(
+        "update user", UserNotFoundException, UserAlreadyExistsError, ValidationError,
+        context="user_id"
+    )
     def update_user(self, user_id: str, user_data: UserUpdate) -> User:
         """
         Update user with business logic validation.
@@ -149,19 +360,20 @@ class UserService:
             InvalidUserDataError: If user data is invalid
             ValidationError: If validation fails
         """
-        try:
-            self._validate_user_id(user_id)
-            self._validate_user_update(user_data)
-            
-            user = self._repository.update_user(user_id, user_data)
-            return user
-            
-        except (UserNotFoundException, UserAlreadyExistsError, ValidationError):
-            raise
-        except Exception as e:
-            self._logger.error("Unexpected error updating user", error=str(e), user_id=user_id)
-            raise InvalidUserDataError(f"Failed to update user: {str(e)}")
+        self._validate_user_id(user_id)
+        self._validate_user_update(user_data)
+        
+        # The previous email comes from the same locked update, so concurrent
+        # updates of one user cannot leave a stale cache entry behind
+        previous_email, user = self._repository.update_user_returning_previous_email(
+            user_id, user_data
+        )
+        self.invalidate_email(previous_email)
+        if user.email != previous_email:
+            self.invalidate_email(user.email)
+        return user
     
+    @_service_guard("delete user", UserNotFoundException, context="user_id")
     def delete_user(self, user_id: str) -> bool:
         """
         Delete user with business logic validation.
@@ -176,67 +388,111 @@ class UserService:
             UserNotFoundError: If user is not found
             InvalidUserDataError: If user ID is invalid
         """
-        try:
-            self._validate_user_id(user_id)
+        self._validate_user_id(user_id)
+        
+        # Fetch and delete in one repository operation
+        user = self._repository.pop_user(user_id)
+        
+        # Additional business logic: flag deletion of inactive users
+        if not user.is_active:
+            self._logger.warning("Deleted inactive user", user_id=user_id)
+        
+        self.invalidate_email(user.email)
+        return True
+    
+    def invalidate_email(self, email: str) -> None:
+        """
+        Drop any cached lookup result for an email address.
+        
+        Args:
+            email: Email address whose cached entry should be removed
+        """
+        key = normalize_email(email)
+        with self._email_cache_lock:
+            self._email_cache.pop(key, None)
+            self._email_miss_cache.pop(key, None)
+    
+    def _encode_cursor(self, user: User) -> str:
+        """
+        Encode a pagination cursor pointing after the given user.
+        
+        Args:
+            user: Last user on the current page
             
-            # Additional business logic: check if user is active before deletion
-            user = self._repository.get_user_by_id(user_id)
-            if not user.is_active:
-                self._logger.warning("Attempting to delete inactive user", user_id=user_id)
+        Returns:
+            URL-safe base64 cursor
+        """
+        raw = f"{user.created_at.isoformat()}|{user.id}".encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+    
+    def _decode_cursor(self, cursor: str) -> Tuple[datetime, str]:
+        """
+        Decode a pagination cursor.
+        
+        Args:
+            cursor: URL-safe base64 cursor
             
-            result = self._repository.delete_user(user_id)
-            return result
+        Returns:
+            (created_at, user_id) key of the last user already returned
             
-        except UserNotFoundException:
-            raise
-        except Exception as e:
-            self._logger.error("Unexpected error deleting user", error=str(e), user_id=user_id)
-            raise InvalidUserDataError(f"Failed to delete user: {str(e)}")
-
+        Raises:
+            ValidationError: If the cursor is malformed
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            created_at, user_id = raw.split("|", 1)
+            timestamp = datetime.fromisoformat(created_at)
+            if timestamp.tzinfo is None:
+                raise ValueError("Cursor timestamp must be timezone-aware")
+            return timestamp, user_id
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValidationError("Invalid pagination cursor")
     
     def _validate_user_creation(self, user_data: UserCreate) -> None:
         """
         Validate user creation data.
         
+        Password length and strength are enforced by the UserCreate model
+        itself and are not re-checked here.
+        
         Args:
             user_data: User creation data
             
         Raises:
             ValidationError: If validation fails
         """
-        if not user_data.email or '@' not in user_data.email:
+        if not user_data.email or _EMAIL_RE.fullmatch(user_data.email) is None:
             raise ValidationError("Invalid email address")
         
-        if not user_data.first_name or len(user_data.first_name.strip()) == 0:
+        if not user_data.first_name or user_data.first_name.isspace():
             raise ValidationError("First name is required")
         
-        if not user_data.last_name or len(user_data.last_name.strip()) == 0:
+        if not user_data.last_name or user_data.last_name.isspace():
             raise ValidationError("Last name is required")
-        
-        if len(user_data.password) < 8:
-            raise ValidationError("Password must be at least 8 characters long")
     
     def _validate_user_update(self, user_data: UserUpdate) -> None:
         """
         Validate user update data.
         
+        A new password is validated by the UserUpdate model itself and is
+        not re-checked here.
+        
         Args:
             user_data: User update data
             
         Raises:
             ValidationError: If validation fails
         """
-        if user_data.email is not None and ('@' not in user_data.email):
+        if user_data.email is not None and _EMAIL_RE.fullmatch(user_data.email) is None:
             raise ValidationError("Invalid email address")
         
-        if user_data.first_name is not None and len(user_data.first_name.strip()) == 0:
+        first_name = user_data.first_name
+        if first_name is not None and (not first_name or first_name.isspace()):
             raise ValidationError("First name cannot be empty")
         
-        if user_data.last_name is not None and len(user_data.last_name.strip()) == 0:
+        last_name = user_data.last_name
+        if last_name is not None and (not last_name or last_name.isspace()):
             raise ValidationError("Last name cannot be empty")
-        
-        if user_data.password is not None and len(user_data.password) < 8:
-            raise ValidationError("Password must be at least 8 characters long")
     
     def _validate_user_id(self, user_id: str) -> None:
         """
@@ -248,11 +504,10 @@ class UserService:
         Raises:
             ValidationError: If user ID is invalid
         """
-        if not user_id or len(user_id.strip()) == 0:
+        if not user_id or user_id.isspace():
             raise ValidationError("User ID is required")
         
-        # Basic UUID validation (simplified)
-        if len(user_id) != 36:  # UUID v4 length
+        if not _is_valid_uuid(user_id):
             raise ValidationError("Invalid user ID format")
     
     def _validate_email(self, email: str) -> None:
@@ -265,5 +520,5 @@ class UserService:
         Raises:
             ValidationError: If email is invalid
         """
-        if not email or '@' not in email:
+        if not email or _EMAIL_RE.fullmatch(email) is None:
             raise ValidationError("Invalid email address")
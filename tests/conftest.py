@@ -1,6 +1,11 @@
 """
 Pytest configuration and fixtures for the user management service.
 """
+import os
+
+# Minimum bcrypt cost keeps password hashing fast in tests
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
@@ -12,7 +17,8 @@ from app.models.user import UserCreate
 @pytest.fixture
 def client():
     """Test client for FastAPI."""
-    return TestClient(app)
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture
@@ -48,7 +54,6 @@ def sample_user(user_service, sample_user_data):
 @pytest.fixture
 def multiple_users(user_service):
     """Multiple users for testing."""
-    users = []
     user_data_list = [
         UserCreate(
             email="user1@example.com",
@@ -73,8 +78,4 @@ def multiple_users(user_service):
         )
     ]
     
-    for user_data in user_data_list:
-        user = user_service.create_user(user_data)
-        users.append(user)
-    
-    return users
+    return user_service.bulk_create_users(user_data_list)
@@ -63,6 +63,20 @@ class TestUserAPI:
         
         response = client.post("/users/", json=user_data)
         assert response.status_code == 422  # Validation error
+    
+    def test_create_user_weak_password(self, client):
+        """Test user creation with passwords missing a character class via API."""
+        for password in ("securepass123", "SECUREPASS123", "SecurePassword"):
+            user_data = {
+                "email": "weak@example.com",
+                "first_name": "John",
+                "last_name": "Doe",
+                "password": password,
+                "is_active": True
+            }
+            
+            response = client.post("/users/", json=user_data)
+            assert response.status_code == 422  # Validation error
 
     def test_get_user_by_id_success(self, client):
         """Test successful user retrieval by ID via API."""
@@ -174,6 +188,56 @@ class TestUserAPI:
         # Verify user is deleted
         get_response = client.get(f"/users/{created_user['id']}")
         assert get_response.status_code == 404
+    
+    def test_get_all_users_paginated(self, client):
+        """Test cursor pagination of the user list via API."""
+        for index in range(3):
+            client.post("/users/", json={
+                "email": f"page{index}@example.com",
+                "first_name": "John",
+                "last_name": "Doe",
+                "password": "SecurePass123",
+                "is_active": True
+            })
+        
+        response = client.get("/users/", params={"limit": 2})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert len(data["users"]) == 2
+        
+        next_response = client.get("/users/", params={"cursor": data["next_cursor"], "limit": 2})
+        next_data = next_response.json()
+        assert [user["email"] for user in next_data["users"]] == ["page2@example.com"]
+        assert next_data["next_cursor"] is None
+        
+        invalid_response = client.get("/users/", params={"cursor": "@@@"})
+        assert invalid_response.status_code == 400
+    
+    def test_stream_all_users(self, client):
+        """Test streaming all users as a JSON array via API."""
+        # Empty store streams an empty array
+        empty_response = client.get("/users/stream")
+        assert empty_response.status_code == 200
+        assert empty_response.json() == []
+        
+        emails = ["stream1@example.com", "stream2@example.com"]
+        for email in emails:
+            client.post("/users/", json={
+                "email": email,
+                "first_name": "John",
+                "last_name": "Doe",
+                "password": "SecurePass123",
+                "is_active": True
+            })
+        
+        response = client.get("/users/stream")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert [user["email"] for user in data] == emails
 
 
 class TestHealthEndpoints:
@@ -199,4 +263,34 @@ class TestHealthEndpoints:
         assert data["status"] == "healthy"
         assert data["service"] == "User Management Service"
         assert "version" in data
+    
+    def test_openapi_and_docs(self, client):
+        """Test OpenAPI schema and documentation endpoints."""
+        response = client.get("/openapi.json")
+        
+        assert response.status_code == 200
+        schema = response.json()
+        assert schema["info"]["title"] == "User Management Service"
+        assert "/users/{user_id}" in schema["paths"]
+        assert "/openapi.json" not in schema["paths"]
+        
+        assert client.get("/docs").status_code == 200
+        assert client.get("/redoc").status_code == 200
+        assert client.get("/docs/oauth2-redirect").status_code == 200
+    
+    def test_openapi_behind_root_path(self):
+        """Test that docs and schema honour a proxy root path."""
+        with TestClient(app, root_path="/api") as proxied_client:
+            schema = proxied_client.get("/openapi.json").json()
+            docs = proxied_client.get("/docs").text
+        
+        assert schema["servers"][0]["url"] == "/api"
+        assert "/api/openapi.json" in docs
+    
+    def test_process_time_header(self, client):
+        """Test that responses carry the processing time header."""
+        for path in ("/health", "/users/"):
+            response = client.get(path)
+            
+            assert float(response.headers["X-Process-Time"]) >= 0
 
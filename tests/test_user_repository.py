@@ -2,8 +2,10 @@
 Unit tests for the user repository.
 """
 import pytest
+import sys
 import threading
 import time
+import uuid
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from app.repositories.user_repository import UserRepository
@@ -34,6 +36,24 @@ class TestUserRepository:
         assert user.created_at is not None
         assert user.updated_at is not None
     
+    def test_create_user_time_ordered_id(self, user_repository):
+        """Test that user IDs are time-ordered UUIDv7 values."""
+        user_data = UserCreate(
+            email="test@example.com",
+            first_name="John",
+            last_name="Doe",
+            password="SecurePass123",
+            is_active=True
+        )
+        
+        user = user_repository.create_user(user_data)
+        parsed = uuid.UUID(user.id)
+        
+        assert parsed.version == 7
+        assert parsed.variant == uuid.RFC_4122
+        # The leading 48 bits carry the creation time in milliseconds
+        assert 0 <= int(user.created_at.timestamp() * 1000) - (parsed.int >> 80) < 1000
+    
     def test_create_user_duplicate_email(self, user_repository):
         """Test user creation with duplicate email."""
         user_data = UserCreate(
@@ -51,6 +71,72 @@ class TestUserRepository:
         with pytest.raises(UserAlreadyExistsError):
             user_repository.create_user(user_data)
     
+    def test_email_index_case_insensitive(self, user_repository):
+        """Test that emails differing only in case refer to the same user."""
+        user_data = UserCreate(
+            email="Alice@example.com",
+            first_name="Alice",
+            last_name="Doe",
+            password="SecurePass123",
+            is_active=True
+        )
+        
+        created_user = user_repository.create_user(user_data)
+        
+        assert user_repository.get_user_by_email("alice@EXAMPLE.com").id == created_user.id
+        
+        with pytest.raises(UserAlreadyExistsError):
+            user_repository.create_user(user_data.model_copy(update={"email": "alice@example.com"}))
+        
+        # Changing only the case keeps the same index entry
+        updated_user = user_repository.update_user(created_user.id, UserUpdate(email="ALICE@example.com"))
+        
+        assert updated_user.email == "ALICE@example.com"
+        assert user_repository.get_user_by_email("alice@example.com").id == created_user.id
+    
+    def test_create_many_success(self, user_repository):
+        """Test creating a batch of users at once."""
+        users_data = [
+            UserCreate(
+                email=f"batch{i}@example.com",
+                first_name="John",
+                last_name="Doe",
+                password="SecurePass123",
+                is_active=True
+            )
+            for i in range(3)
+        ]
+        
+        users = user_repository.create_many(users_data)
+        
+        assert [user.email for user in users] == [data.email for data in users_data]
+        assert user_repository.get_user_count() == 3
+        assert user_repository.get_user_by_email("batch1@example.com").id == users[1].id
+    
+    def test_create_many_duplicate_email(self, user_repository):
+        """Test that a batch with a conflicting email creates no users."""
+        user_data = UserCreate(
+            email="test@example.com",
+            first_name="John",
+            last_name="Doe",
+            password="SecurePass123",
+            is_active=True
+        )
+        other_data = user_data.model_copy(update={"email": "other@example.com"})
+        
+        # Duplicate within the batch
+        with pytest.raises(UserAlreadyExistsError):
+            user_repository.create_many([user_data, other_data, user_data])
+        
+        assert user_repository.get_user_count() == 0
+        
+        # Duplicate of an existing user
+        user_repository.create_user(user_data)
+        with pytest.raises(UserAlreadyExistsError):
+            user_repository.create_many([other_data, user_data])
+        
+        assert user_repository.get_user_count() == 1
+    
     def test_get_user_by_id_success(self, user_repository):
         """Test successful user retrieval by ID."""
         user_data = UserCreate(
@@ -110,6 +196,24 @@ class TestUserRepository:
         # Allow for microsecond precision issues
         assert updated_user.updated_at >= created_user.updated_at
     
+    def test_update_user_returning_previous_email(self, user_repository):
+        """Test that an email change reports the email the user had before."""
+        user_data = UserCreate(
+            email="test@example.com",
+            first_name="John",
+            last_name="Doe",
+            password="SecurePass123",
+            is_active=True
+        )
+        
+        created_user = user_repository.create_user(user_data)
+        previous_email, updated_user = user_repository.update_user_returning_previous_email(
+            created_user.id, UserUpdate(email="moved@example.com")
+        )
+        
+        assert previous_email == "test@example.com"
+        assert updated_user.email == "moved@example.com"
+    
     def test_delete_user_success(self, user_repository):
         """Test successful user deletion."""
         user_data = UserCreate(
@@ -125,6 +229,110 @@ class TestUserRepository:
         result = user_repository.delete_user(created_user.id)
         
         assert result == True
+    
+    def test_pop_user(self, user_repository):
+        """Test deleting a user and getting it back in one call."""
+        user_data = UserCreate(
+            email="test@example.com",
+            first_name="John",
+            last_name="Doe",
+            password="SecurePass123",
+            is_active=True
+        )
+        
+        created_user = user_repository.create_user(user_data)
+        
+        popped_user = user_repository.pop_user(created_user.id)
+        
+        assert popped_user.id == created_user.id
+        assert popped_user.email == created_user.email
+        with pytest.raises(UserNotFoundException):
+            user_repository.get_user_by_id(created_user.id)
+        with pytest.raises(UserNotFoundException):
+            user_repository.pop_user(created_user.id)
+    
+    def test_password_stored_as_hash(self, user_repository):
+        """Test that only a bcrypt hash of the password is stored."""
+        user_data = UserCreate(
+            email="test@example.com",
+            first_name="John",
+            last_name="Doe",
+            password="SecurePass123",
+            is_active=True
+        )
+        
+        created_user = user_repository.create_user(user_data)
+        record = user_repository._users[created_user.id]
+        
+        assert not hasattr(record, "__dict__")
+        assert record.password_hash != user_data.password
+        assert user_repository._verify_password("SecurePass123", record.password_hash)
+        
+        user_repository.update_user(created_user.id, UserUpdate(password="NewSecurePass456"))
+        updated = user_repository._users[created_user.id]
+        
+        # Updates publish a new record instead of changing the stored one
+        assert updated is not record
+        assert user_repository._verify_password("SecurePass123", record.password_hash)
+        assert user_repository._verify_password("NewSecurePass456", updated.password_hash)
+        assert not user_repository._verify_password("SecurePass123", updated.password_hash)
+    
+    def test_get_all_users_snapshot_invalidated(self, user_repository):
+        """Test that the all-users snapshot is reused until users change."""
+        user_data = UserCreate(
+            email="test@example.com",
+            first_name="John",
+            last_name="Doe",
+            password="SecurePass123",
+            is_active=True
+        )
+        
+        assert user_repository.get_all_users() == ()
+        
+        created_user = user_repository.create_user(user_data)
+        snapshot = user_repository.get_all_users()
+        
+        assert snapshot == (created_user,)
+        assert user_repository.get_all_users() is snapshot
+        
+        user_repository.delete_user(created_user.id)
+        
+        assert user_repository.get_all_users() == ()
+    
+    def test_get_all_users_with_count(self, user_repository):
+        """Test that users and their count come from the same snapshot."""
+        user_data = UserCreate(
+            email="test@example.com",
+            first_name="John",
+            last_name="Doe",
+            password="SecurePass123",
+            is_active=True
+        )
+        
+        created_user = user_repository.create_user(user_data)
+        users, total = user_repository.get_all_users_with_count()
+        
+        assert users == (created_user,)
+        assert total == 1
+    
+    def test_version_bumped_on_mutation(self, user_repository):
+        """Test that every create, update and delete bumps the version."""
+        user_data = UserCreate(
+            email="test@example.com",
+            first_name="John",
+            last_name="Doe",
+            password="SecurePass123",
+            is_active=True
+        )
+        
+        initial = user_repository.get_version()
+        user = user_repository.create_user(user_data)
+        after_create = user_repository.get_version()
+        user_repository.update_user(user.id, UserUpdate(first_name="Jane"))
+        after_update = user_repository.get_version()
+        user_repository.delete_user(user.id)
+        
+        assert initial < after_create < after_update < user_repository.get_version()
 
 
 class TestUserRepositoryThreadSafety:
@@ -154,3 +362,52 @@ class TestUserRepositoryThreadSafety:
         # Verify all emails are unique
         emails = [user.email for user in users]
         assert len(set(emails)) == 5
+    
+    def test_concurrent_duplicate_creation(self, user_repository):
+        """Test that only one of several concurrent creates for the same email wins."""
+        user_data = UserCreate(
+            email="same@example.com",
+            first_name="John",
+            last_name="Doe",
+            password="SecurePass123",
+            is_active=True
+        )
+        
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(lambda _: user_repository._try_create(user_data), range(5)))
+        
+        assert sum(result is not None for result in results) == 1
+        assert user_repository.get_user_count() == 1
+    
+    def test_concurrent_reads_see_whole_updates(self, user_repository):
+        """Test that lock-free reads never observe a partly applied update."""
+        user = user_repository.create_user(UserCreate(
+            email="test@example.com",
+            first_name="Name0",
+            last_name="Name0",
+            password="SecurePass123",
+            is_active=True
+        ))
+        done = threading.Event()
+        
+        def writer():
+            for i in range(10000):
+                name = f"Name{i}"
+                user_repository.update_user(user.id, UserUpdate(first_name=name, last_name=name))
+            done.set()
+        
+        # Switch threads often so a torn read has a chance to show up
+        previous_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            thread = threading.Thread(target=writer)
+            thread.start()
+            torn = 0
+            while not done.is_set():
+                current = user_repository.get_user_by_id(user.id)
+                torn += current.first_name != current.last_name
+            thread.join()
+        finally:
+            sys.setswitchinterval(previous_interval)
+        
+        assert torn == 0
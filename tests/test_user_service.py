@@ -1,6 +1,7 @@
 """
 Unit tests for the user service.
 """
+import json
 import pytest
 from datetime import datetime
 
@@ -58,6 +59,51 @@ class TestUserService:
         with pytest.raises(UserAlreadyExistsError):
             user_service.create_user(user_data2)
     
+    def test_create_user_blank_name(self, user_service):
+        """Test user creation with whitespace-only names."""
+        user_data = UserCreate(
+            email="test@example.com",
+            first_name=" \t",
+            last_name="Doe",
+            password="SecurePass123"
+        )
+        
+        with pytest.raises(ValidationError):
+            user_service.create_user(user_data)
+    
+    def test_bulk_create_users_rejects_whole_batch(self, user_service, multiple_users):
+        """Test that an invalid or duplicate entry rejects the whole batch."""
+        valid = UserCreate(
+            email="new@example.com",
+            first_name="Dana",
+            last_name="White",
+            password="SecurePass123"
+        )
+        duplicate = UserCreate(
+            email=multiple_users[0].email,
+            first_name="Eve",
+            last_name="Black",
+            password="SecurePass123"
+        )
+        blank = UserCreate(
+            email="blank@example.com",
+            first_name="Frank",
+            last_name=" ",
+            password="SecurePass123"
+        )
+        
+        with pytest.raises(UserAlreadyExistsError):
+            user_service.bulk_create_users([valid, duplicate])
+        with pytest.raises(ValidationError):
+            user_service.bulk_create_users([valid, blank])
+        
+        assert user_service.get_all_users().total == len(multiple_users)
+    
+    def test_update_user_blank_name(self, user_service, sample_user):
+        """Test user update with a whitespace-only name."""
+        with pytest.raises(ValidationError):
+            user_service.update_user(sample_user.id, UserUpdate(last_name="   "))
+    
     def test_get_user_by_id_success(self, user_service, sample_user):
         """Test successful user retrieval by ID."""
         retrieved_user = user_service.get_user_by_id(sample_user.id)
@@ -67,6 +113,24 @@ class TestUserService:
         assert retrieved_user.first_name == sample_user.first_name
         assert retrieved_user.last_name == sample_user.last_name
     
+    def test_get_user_by_id_invalid_format(self, user_service):
+        """Test retrieval with IDs that are not UUIDs."""
+        for user_id in ("", "short-id", "z" * 36, "----12345678123456781234567812345678"):
+            with pytest.raises(InvalidUserDataError):
+                user_service.get_user_by_id(user_id)
+    
+    def test_get_users_by_ids(self, user_service, multiple_users):
+        """Test batch retrieval of users by ID."""
+        missing_id = "550e8400-e29b-41d4-a716-446655440000"
+        user_ids = [multiple_users[2].id, missing_id, multiple_users[0].id]
+        
+        users = user_service.get_users_by_ids(user_ids)
+        
+        assert [user.id for user in users] == [multiple_users[2].id, multiple_users[0].id]
+        
+        with pytest.raises(InvalidUserDataError, match="^Invalid user ID format: not-a-uuid$"):
+            user_service.get_users_by_ids([multiple_users[0].id, "not-a-uuid"])
+    
     def test_get_user_by_email_success(self, user_service, sample_user):
         """Test successful user retrieval by email."""
         retrieved_user = user_service.get_user_by_email(sample_user.email)
@@ -74,6 +138,49 @@ class TestUserService:
         assert retrieved_user.id == sample_user.id
         assert retrieved_user.email == sample_user.email
     
+    def test_get_user_by_email_cached(self, user_service, sample_user):
+        """Test that email lookups are cached and invalidated on writes."""
+        first = user_service.get_user_by_email("TEST@example.com")
+        
+        assert user_service.get_user_by_email(sample_user.email) is first
+        
+        user_service.update_user(sample_user.id, UserUpdate(first_name="Jane"))
+        
+        assert user_service.get_user_by_email(sample_user.email).first_name == "Jane"
+        
+        user_service.update_user(sample_user.id, UserUpdate(email="moved@example.com"))
+        
+        with pytest.raises(UserNotFoundException):
+            user_service.get_user_by_email(sample_user.email)
+        assert user_service.get_user_by_email("moved@example.com").id == sample_user.id
+        
+        user_service.delete_user(sample_user.id)
+        
+        with pytest.raises(UserNotFoundException):
+            user_service.get_user_by_email("moved@example.com")
+    
+    def test_get_user_by_email_miss_cached(self, user_service):
+        """Test that email misses are cached until a user is created with that email."""
+        with pytest.raises(UserNotFoundException):
+            user_service.get_user_by_email("later@example.com")
+        
+        assert "later@example.com" in user_service._email_miss_cache
+        
+        user_service.create_user(UserCreate(
+            email="Later@example.com",
+            first_name="John",
+            last_name="Doe",
+            password="SecurePass123"
+        ))
+        
+        assert user_service.get_user_by_email("later@example.com").email == "Later@example.com"
+    
+    def test_get_user_by_email_invalid_format(self, user_service):
+        """Test email lookups with malformed addresses."""
+        for email in ("", "no-at-sign", "user@localhost", "two@@example.com", "sp ace@example.com"):
+            with pytest.raises(InvalidUserDataError):
+                user_service.get_user_by_email(email)
+    
     def test_get_all_users(self, user_service, multiple_users):
         """Test retrieval of all users."""
         result = user_service.get_all_users()
@@ -81,6 +188,35 @@ class TestUserService:
         assert result.total == 3
         assert len(result.users) == 3
     
+    def test_get_all_users_json_cached(self, user_service, multiple_users):
+        """Test that the serialized listing is reused until the users change."""
+        body = user_service.get_all_users_json()
+        
+        assert json.loads(body)["total"] == len(multiple_users)
+        assert user_service.get_all_users_json() is body
+        
+        user_service.delete_user(multiple_users[0].id)
+        
+        assert json.loads(user_service.get_all_users_json())["total"] == len(multiple_users) - 1
+    
+    def test_get_all_users_paginated(self, user_service, multiple_users):
+        """Test cursor pagination across all users."""
+        first_page = user_service.get_all_users(limit=2)
+        
+        assert first_page.total == 3
+        assert [user.id for user in first_page.users] == [user.id for user in multiple_users[:2]]
+        assert first_page.next_cursor is not None
+        
+        second_page = user_service.get_all_users(cursor=first_page.next_cursor, limit=2)
+        
+        assert [user.id for user in second_page.users] == [multiple_users[2].id]
+        assert second_page.next_cursor is None
+    
+    def test_get_all_users_invalid_cursor(self, user_service):
+        """Test pagination with a malformed cursor."""
+        with pytest.raises(ValidationError):
+            user_service.get_all_users(cursor="not-a-cursor")
+    
     def test_update_user_success(self, user_service, sample_user):
         """Test successful user update."""
         update_data = UserUpdate(
@@ -111,3 +247,31 @@ class TestUserService:
         result = user_service.delete_user(sample_user.id)
         
         assert result == True
+    
+    def test_unexpected_error_wrapped(self, user_service, monkeypatch):
+        """Test that unexpected repository errors surface as InvalidUserDataError."""
+        def broken(*args, **kwargs):
+            raise RuntimeError("storage unavailable")
+        
+        monkeypatch.setattr(user_service._repository, "get_all_users_with_count", broken)
+        
+        with pytest.raises(InvalidUserDataError, match="Failed to retrieve users"):
+            user_service.get_all_users()
+    
+    def test_unexpected_error_logs_context(self, user_service, monkeypatch):
+        """Test that wrapped errors are logged with the affected user's identifier."""
+        logged = []
+        
+        class RecordingLogger:
+            def error(self, event, **fields):
+                logged.append((event, fields))
+        
+        monkeypatch.setattr(user_service, "_logger", RecordingLogger())
+        
+        with pytest.raises(InvalidUserDataError):
+            user_service.delete_user("not-a-uuid")
+        
+        event, fields = logged[0]
+        assert event == "Unexpected service error"
+        assert fields["action"] == "delete user"
+        assert fields["user_id"] == "not-a-uuid"